@@ -12,7 +12,6 @@ from .chunks import (
 )
 from .document_chunking import BaseDocumentChunker, TOCNode
 from .md_chunking import MarkdownTOCChunker
-from .pdf_chunking import PDFTOCChunker
 from .docx_chunking import DOCXTOCChunker
 from .html_chunking import HTMLTOCChunker
 from .jupyter_chunking import JupyterNotebookTOCChunker
@@ -31,3 +30,12 @@ __all__ = [
     "JupyterNotebookTOCChunker",
     "RSTTOCChunker",
 ]
+
+
+def __getattr__(name: str) -> type:
+    # PyMuPDF is a heavy native library, so it is only loaded once PDFs are used
+    if name == "PDFTOCChunker":
+        from .pdf_chunking import PDFTOCChunker
+
+        return PDFTOCChunker
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
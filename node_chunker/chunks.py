@@ -1,3 +1,5 @@
+import hashlib
+import importlib.metadata
 import importlib.util
 import logging
 import os
@@ -6,11 +8,23 @@ from typing import List, Optional, Set, Union
 
 from llama_index.core.schema import TextNode
 
-from .utils import download_temp_file, read_file_content
+from .utils import (
+    download_temp_file,
+    load_cached_nodes,
+    read_file_content,
+    save_cached_nodes,
+)
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+# Bump whenever chunking output changes, so nodes cached by older code are not reused
+CACHE_SCHEMA_VERSION = 1
+try:
+    _PACKAGE_VERSION = importlib.metadata.version("node-chunker")
+except importlib.metadata.PackageNotFoundError:  # Running from a source checkout
+    _PACKAGE_VERSION = "unknown"
+
 
 # Define document format enum
 class DocumentFormat(str, Enum):
@@ -137,10 +151,42 @@ def _import_chunker_class(format_type: DocumentFormat):
         return None
 
 
+def _get_cache_key(
+    source: str, format_type: DocumentFormat, is_url: bool
+) -> Optional[str]:
+    """
+    Build the node cache key for a source.
+
+    Args:
+        source: Path to the document file or URL, or content text
+        format_type: Document format used to parse the source
+        is_url: Whether the source is a URL
+
+    Returns:
+        A hex digest identifying the source and its version, or None if it can't be cached
+    """
+    if is_url:
+        return None  # Remote content can change without notice
+
+    if os.path.exists(source):
+        # Files are identified by location and version, so edits invalidate the entry
+        stat = os.stat(source)
+        identity = f"{os.path.abspath(source)}|{stat.st_mtime_ns}|{stat.st_size}"
+    else:
+        identity = source  # Inline content is its own version
+
+    # Nodes written by another version of the chunker may be laid out differently
+    version = f"{_PACKAGE_VERSION}|{CACHE_SCHEMA_VERSION}"
+    return hashlib.sha256(
+        f"{version}|{format_type.value}|{identity}".encode("utf-8")
+    ).hexdigest()
+
+
 def chunk_document_by_toc_to_text_nodes(
     source: str,
     is_url: bool = None,
     format_type: Optional[Union[DocumentFormat, str]] = None,
+    cache_dir: Optional[str] = None,
 ) -> List[TextNode]:
     """
     Create a TOC-based hierarchical chunking of a document and return TextNode objects.
@@ -149,6 +195,8 @@ def chunk_document_by_toc_to_text_nodes(
         source: Path to the document file or URL, or content text
         is_url: Force URL interpretation if True, file path if False, or auto-detect if None
         format_type: Document format to use (PDF by default if not specified)
+        cache_dir: Optional directory where nodes are cached; repeated calls for an
+            unchanged file or identical content text skip parsing. URLs are never cached.
 
     Returns:
         A list of TextNode objects representing the document chunks.
@@ -177,14 +225,42 @@ def chunk_document_by_toc_to_text_nodes(
             f"Available formats: {available}"
         )
 
+    if is_url is None:
+        is_url = source.startswith(("http://", "https://", "ftp://"))
+
+    cache_key = _get_cache_key(source, format_type, is_url) if cache_dir else None
+    if cache_dir and cache_key:
+        cached_nodes = load_cached_nodes(cache_dir, cache_key)
+        if cached_nodes is not None:
+            return cached_nodes
+
+    text_nodes = _chunk_source(source, is_url, format_type)
+
+    if cache_dir and cache_key:
+        save_cached_nodes(cache_dir, cache_key, text_nodes)
+
+    return text_nodes
+
+
+def _chunk_source(
+    source: str, is_url: bool, format_type: DocumentFormat
+) -> List[TextNode]:
+    """
+    Chunk a document with the chunker for its format.
+
+    Args:
+        source: Path to the document file or URL, or content text
+        is_url: Whether the source is a URL
+        format_type: Document format to use
+
+    Returns:
+        A list of TextNode objects representing the document chunks.
+    """
     temp_file_path = None
     actual_source_path = source
     source_name_for_metadata = source  # Original source name for metadata
 
     try:
-        if is_url is None:
-            is_url = source.startswith(("http://", "https://", "ftp://"))
-
         # Handle specific formats
         if format_type == DocumentFormat.MARKDOWN:
             # For markdown, source can be either a file path or the markdown text itself
@@ -212,10 +288,8 @@ def chunk_document_by_toc_to_text_nodes(
                 html_content = read_file_content(source)
             elif is_url:
                 # Download HTML content from URL
-                import requests
-                response = requests.get(source, timeout=30)
-                response.raise_for_status()
-                html_content = response.text
+                from .utils import download_text
+                html_content = download_text(source)
                 source_name_for_metadata = source  # Use URL as source name
             else:
                 # It's the HTML content itself
@@ -268,10 +342,8 @@ def chunk_document_by_toc_to_text_nodes(
                 rst_content = read_file_content(source)
             elif is_url:
                 # Download RST content from URL
-                import requests
-                response = requests.get(source, timeout=30)
-                response.raise_for_status()
-                rst_content = response.text
+                from .utils import download_text
+                rst_content = download_text(source)
                 source_name_for_metadata = source  # Use URL as source name
             else:
                 # It's the RST content itself
@@ -285,16 +357,18 @@ def chunk_document_by_toc_to_text_nodes(
 
         elif format_type == DocumentFormat.PDF:
             # PDF handling
+            pdf_bytes = None
             if is_url:
+                # PyMuPDF opens PDFs from memory, so skip the temporary file
                 logger.info(f"Downloading PDF from URL: {source}")
-                from .utils import download_temp_file
-                temp_file_path = download_temp_file(source, suffix=".pdf")
-                actual_source_path = temp_file_path
+                from .utils import download_content
+                pdf_bytes = download_content(source)
 
             PDFTOCChunker = _import_chunker_class(DocumentFormat.PDF)
             with PDFTOCChunker(
                 pdf_path=actual_source_path,
                 source_display_name=source_name_for_metadata,
+                pdf_bytes=pdf_bytes,
             ) as chunker:
                 chunker.build_toc_tree()
                 return chunker.get_text_nodes()
@@ -1,7 +1,8 @@
+import functools
 import os
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from llama_index.core.schema import (
     NodeRelationship,
@@ -11,6 +12,11 @@ from llama_index.core.schema import (
 )
 from pydantic import BaseModel, Field
 
+# Bound once at import; relationship wiring runs for every node
+_SOURCE = NodeRelationship.SOURCE
+_PARENT = NodeRelationship.PARENT
+_CHILD = NodeRelationship.CHILD
+
 
 class TOCNode(BaseModel):
     """
@@ -22,9 +28,12 @@ class TOCNode(BaseModel):
         level: The hierarchical level of this node (0 = root, 1 = chapter, etc.)
         parent: Optional parent TOCNode
         children: List of child TOCNodes
-        content: Text content for this section
+        content: Text content for this section. PDFTOCChunker fills it lazily, so
+            it stays empty until get_node_content() or get_text_nodes() is called
         end_page: Optional ending page number of this section
         y_position: Optional y-coordinate of the heading on its page
+        content_range: Optional (start_page, end_page, start_y, end_y) span whose
+            text has not been extracted into content yet
     """
     title: str
     page_num: int
@@ -34,6 +43,9 @@ class TOCNode(BaseModel):
     content: str = ""
     end_page: Optional[int] = None
     y_position: Optional[float] = None
+    content_range: Optional[
+        Tuple[int, int, Optional[float], Optional[float]]
+    ] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -65,6 +77,7 @@ class BaseDocumentChunker(ABC):
         self.source_display_name = source_display_name
         self.root_node = TOCNode(title="Document Root", page_num=0, level=0)
         self.document_id = f"doc_{uuid.uuid4()}"
+        self._text_nodes: List[TextNode] = []  # Result of the last get_text_nodes call
 
     @abstractmethod
     def load_document(self) -> None:
@@ -93,6 +106,14 @@ class BaseDocumentChunker(ABC):
         collect_nodes(self.root_node)
         return nodes
 
+    def get_node_content(self, toc_node: TOCNode) -> str:
+        """
+        Get the text content of a node.
+
+        Chunkers that defer content extraction override this to extract on first access.
+        """
+        return toc_node.content
+
     def get_text_nodes(self) -> List[TextNode]:
         """
         Convert the TOCNode tree into a list of LlamaIndex TextNode objects,
@@ -122,24 +143,44 @@ class BaseDocumentChunker(ABC):
             relationships = self._create_node_relationships(
                 toc_node, toc_node_obj_id_to_text_node_id_map
             )
+            content = self.get_node_content(toc_node)
 
             # Skip empty Document Root nodes
             if (toc_node.title == "Document Root" and 
-                not toc_node.content.strip() and 
+                not content.strip() and 
                 toc_node.level == 0):
                 if not any(tn.metadata.get("title") == "Document Root" for tn in text_node_list):
                     pass  # Skip adding Document Root if it has no content
             else:
                 text_node = TextNode(
                     id_=text_node_id,
-                    text=toc_node.content or "",
+                    text=content or "",
                     metadata=metadata,
                     relationships=relationships,
                 )
                 text_node_list.append(text_node)
 
+        # New node ids, so lookups built from a previous call are stale
+        self._text_nodes = text_node_list
+        self.__dict__.pop("nodes_by_id", None)
+        self.__dict__.pop("nodes_by_title", None)
+
         return text_node_list
 
+    @functools.cached_property
+    def nodes_by_id(self) -> Dict[str, TextNode]:
+        """TextNodes from the last get_text_nodes call, keyed by node id."""
+        return {node.id_: node for node in self._text_nodes}
+
+    @functools.cached_property
+    def nodes_by_title(self) -> Dict[str, TextNode]:
+        """
+        TextNodes from the last get_text_nodes call, keyed by title.
+
+        When several nodes share a title, the last one in document order is kept.
+        """
+        return {node.metadata["title"]: node for node in self._text_nodes}
+
     def _create_node_metadata(self, toc_node: TOCNode) -> Dict[str, Any]:
         """Create metadata dictionary for a node."""
         metadata = {
@@ -193,7 +234,7 @@ class BaseDocumentChunker(ABC):
         relationships = {}
         
         # Add source relationship
-        relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(
+        relationships[_SOURCE] = RelatedNodeInfo(
             node_id=self.document_id,
             node_type=ObjectType.DOCUMENT,
             metadata={"file_name": os.path.basename(self.source_display_name)},
@@ -202,7 +243,7 @@ class BaseDocumentChunker(ABC):
         # Add parent relationship if exists
         if toc_node.parent and id(toc_node.parent) in node_id_map:
             parent_text_node_id = node_id_map[id(toc_node.parent)]
-            relationships[NodeRelationship.PARENT] = RelatedNodeInfo(
+            relationships[_PARENT] = RelatedNodeInfo(
                 node_id=parent_text_node_id, node_type=ObjectType.TEXT
             )
 
@@ -218,7 +259,7 @@ class BaseDocumentChunker(ABC):
                 )
                 
         if child_related_nodes:
-            relationships[NodeRelationship.CHILD] = child_related_nodes
+            relationships[_CHILD] = child_related_nodes
 
         return relationships
 
@@ -1,14 +1,57 @@
 import logging
-from typing import Optional, List
+import math
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 import fitz  # PyMuPDF
 
 from .document_chunking import BaseDocumentChunker, TOCNode
 
 logger = logging.getLogger(__name__)
-TEXT_EXTRACTION_FLAGS = (
-    fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_LIGATURES & ~fitz.TEXT_PRESERVE_IMAGES
+# Plain block text: expand ligatures and normalize whitespace, but keep clipping to the
+# mediabox so off-page text stays out of the chunks
+TEXT_EXTRACTION_FLAGS = fitz.TEXTFLAGS_BLOCKS & ~(
+    fitz.TEXT_PRESERVE_LIGATURES
+    | fitz.TEXT_PRESERVE_IMAGES
+    | fitz.TEXT_PRESERVE_WHITESPACE
 )
+# Matches everything except letters, digits and whitespace (same as isalnum/isspace)
+NON_ALNUM_PATTERN = re.compile(r"[^\w\s]|_")
+
+
+def _clean_text(text: str) -> str:
+    """Strip punctuation and lowercase text for heading matching."""
+    return NON_ALNUM_PATTERN.sub("", text).strip().lower()
+
+
+def _parse_text_blocks(page: "fitz.Page") -> List[Tuple[float, float, List[str]]]:
+    """Get the non-empty text blocks of a page as (y0, y1, lines) in reading order."""
+    # Block tuples are (x0, y0, x1, y1, text, block_no, block_type)
+    blocks = page.get_text("blocks", flags=TEXT_EXTRACTION_FLAGS)
+    text_blocks = []
+    for block in blocks:
+        if block[6] == 0:  # Text block
+            lines = block[4].splitlines()
+            if lines:
+                text_blocks.append((block[1], block[3], lines))
+    return text_blocks
+
+
+def _load_text_blocks(
+    pdf_path: str, pdf_bytes: Optional[bytes], page_nums: List[int]
+) -> List[List[Tuple[float, float, List[str]]]]:
+    """Open the PDF in a worker process and parse the text blocks of the given pages."""
+    # fitz.Document objects can't be shared across processes, so each worker opens its own
+    if pdf_bytes is not None:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    else:
+        doc = fitz.open(pdf_path)
+    try:
+        return [_parse_text_blocks(doc.load_page(page_num)) for page_num in page_nums]
+    finally:
+        doc.close()
 
 
 class PDFTOCChunker(BaseDocumentChunker):
@@ -16,24 +59,54 @@ class PDFTOCChunker(BaseDocumentChunker):
     A document chunker that creates a hierarchical tree of nodes based on the PDF's table of contents.
     """
 
-    def __init__(self, pdf_path: str, source_display_name: str):
+    def __init__(
+        self,
+        pdf_path: str,
+        source_display_name: str,
+        pdf_bytes: Optional[bytes] = None,
+        num_workers: int = 1,
+        doc_loader: Optional[Callable[..., "fitz.Document"]] = None,
+    ):
         """
         Initialize the chunker with the path to the PDF file.
 
         Args:
             pdf_path: Path to the PDF file (can be temporary)
             source_display_name: The original name of the source (e.g., URL or original filename)
+            pdf_bytes: Optional in-memory PDF content, opened instead of reading pdf_path
+            num_workers: Number of processes used to extract page text; 1 extracts
+                pages lazily in this process
+            doc_loader: Optional replacement for fitz.open, called the same way; worker
+                processes always use fitz.open
         """
         super().__init__(pdf_path, source_display_name)
+        self.pdf_bytes = pdf_bytes
+        self.num_workers = num_workers
+        self._open = doc_loader or fitz.open
         self.doc = None
         self.toc = None
         self._document_loaded = False
+        # Per-page cache of text blocks as (y0, y1, lines)
+        self._page_blocks: Dict[int, List[Tuple[float, float, List[str]]]] = {}
+        # Per-page cache of cleaned text lines and a word -> line index over them
+        self._page_lines: Dict[int, List[Tuple[float, str]]] = {}
+        self._line_index: Dict[int, Dict[str, List[int]]] = {}
         self.root_node.y_position = 0.0  # Document root starts at y=0 on page 0
 
     def load_document(self) -> None:
-        """Load the PDF document and extract its TOC."""
+        """
+        Load the PDF document and extract its TOC.
+
+        The document is opened once per chunker; later calls reuse it until close().
+        """
+        if self._document_loaded:
+            return
+
         try:
-            self.doc = fitz.open(self.source_path)
+            if self.pdf_bytes is not None:
+                self.doc = self._open(stream=self.pdf_bytes, filetype="pdf")
+            else:
+                self.doc = self._open(self.source_path)
             self.toc = self.doc.get_toc()
             self._document_loaded = True
 
@@ -56,184 +129,318 @@ class PDFTOCChunker(BaseDocumentChunker):
         if not self.toc:
             # Create a single node for the whole document
             self.root_node.end_page = self.doc.page_count - 1
+            page_texts = []
             for page_num in range(self.doc.page_count):
                 page = self.doc.load_page(page_num)
-                self.root_node.content += page.get_text() + "\n"
+                page_texts.append(page.get_text())
+            self.root_node.content = "\n".join(page_texts)
             return self.root_node
 
         # Process PyMuPDF TOC and create a tree
         self._process_outline(self.toc, self.root_node)
 
-        # Determine end pages and extract content
-        self._set_end_pages_and_content(self.root_node)
+        if self.num_workers > 1:
+            self._prefetch_text_blocks()
+
+        # Locate each heading on its page
+        self._set_heading_positions()
+
+        # Determine end pages and content ranges
+        self._set_page_ranges()
 
         return self.root_node
 
-    def _find_heading_y_position(self, page: fitz.Page, title: str) -> float:
+    def _get_text_blocks(self, page_num: int) -> List[Tuple[float, float, List[str]]]:
+        """
+        Get the non-empty text blocks of a page, fetched from PyMuPDF once and cached.
+
+        Args:
+            page_num: 0-based page index
+
+        Returns:
+            A list of (y0, y1, lines) tuples in reading order
+        """
+        if page_num not in self._page_blocks:
+            self._page_blocks[page_num] = _parse_text_blocks(
+                self.doc.load_page(page_num)
+            )
+
+        return self._page_blocks[page_num]
+
+    def _prefetch_text_blocks(self) -> None:
+        """
+        Parse the text blocks of every page up front, spread over worker processes.
+
+        Pages are split into one contiguous run per worker, and each worker reopens the
+        document itself. The results fill the same cache _get_text_blocks reads from.
+        """
+        page_nums = [
+            page_num
+            for page_num in range(self.doc.page_count)
+            if page_num not in self._page_blocks
+        ]
+        if not page_nums:
+            return
+
+        run_size = math.ceil(len(page_nums) / self.num_workers)
+        runs = [page_nums[i : i + run_size] for i in range(0, len(page_nums), run_size)]
+        with ProcessPoolExecutor(max_workers=len(runs)) as executor:
+            results = executor.map(
+                _load_text_blocks,
+                [self.source_path] * len(runs),
+                [self.pdf_bytes] * len(runs),
+                runs,
+            )
+            for run, run_blocks in zip(runs, results, strict=True):
+                self._page_blocks.update(zip(run, run_blocks, strict=True))
+
+    def _get_line_index(
+        self, page_num: int
+    ) -> Tuple[List[Tuple[float, str]], Dict[str, List[int]]]:
+        """
+        Get the cleaned text lines of a page and an index from each word to the lines containing it.
+
+        Both are built on the first request for a page and cached afterwards.
+
+        Args:
+            page_num: 0-based page index
+
+        Returns:
+            A tuple of (lines, index) where lines is a list of (block y0, cleaned line text)
+            in reading order and index maps each word to the positions of its lines
+        """
+        if page_num not in self._line_index:
+            lines: List[Tuple[float, str]] = []
+            index: Dict[str, List[int]] = {}
+            for block_y0, _, block_lines in self._get_text_blocks(page_num):
+                for line_text in block_lines:
+                    clean_line = _clean_text(line_text)
+                    for word in set(clean_line.split()):
+                        index.setdefault(word, []).append(len(lines))
+                    lines.append((block_y0, clean_line))
+
+            self._page_lines[page_num] = lines
+            self._line_index[page_num] = index
+
+        return self._page_lines[page_num], self._line_index[page_num]
+
+    def _find_heading_y_position(
+        self, page_num: int, title: str, clean_title: Optional[str] = None
+    ) -> float:
         """
         Find the y-coordinate of a heading on a page.
         Returns the y-coordinate (bbox[1]) or 0.0 if not found.
+
+        clean_title may be passed when the caller has already cleaned the title.
         """
         # Clean the title for matching
-        clean_title = "".join(c for c in title if c.isalnum() or c.isspace()).strip().lower()
+        if clean_title is None:
+            clean_title = _clean_text(title)
         if not clean_title:
             return 0.0
 
-        blocks = page.get_text("dict", flags=TEXT_EXTRACTION_FLAGS)["blocks"]
-        
-        for block in blocks:
-            if block.get("type") == 0:  # Text block
-                for line in block.get("lines", []):
-                    line_text = "".join(span["text"] for span in line.get("spans", []))
-                    clean_line = "".join(
-                        c for c in line_text if c.isalnum() or c.isspace()
-                    ).strip().lower()
-                    
-                    if clean_title in clean_line:
-                        return block["bbox"][1]  # y0 of the block
-                        
+        lines, index = self._get_line_index(page_num)
+
+        # Only lines sharing the title's first word can contain it as a whole word
+        for line_idx in index.get(clean_title.split()[0], []):
+            y0, clean_line = lines[line_idx]
+            if clean_title in clean_line:
+                return y0
+
+        # Title may start mid-word in the line (e.g. "2 methods" in "12 methods")
+        for y0, clean_line in lines:
+            if clean_title in clean_line:
+                return y0
+
+        # Headings wrapped over several lines are only found by MuPDF's own search
+        rects = self.doc.load_page(page_num).search_for(title)
+        if rects:
+            match_y = rects[0].y0
+            for block_y0, block_y1, _ in self._get_text_blocks(page_num):
+                if block_y0 <= match_y < block_y1:
+                    return block_y0  # Report the block top like line matches do
+            return match_y
+
         return 0.0  # Fallback if title not found
 
     def _process_outline(self, toc_items: List, parent_node: TOCNode, level=1) -> None:
         """
         Process TOC items into our node tree.
 
+        The flat TOC list is walked once, keeping a stack of the nodes that are still
+        open. Items that skip a level have no parent to attach to and are dropped.
+
         Args:
             toc_items: TOC items from PyMuPDF
             parent_node: The parent node to attach to
-            level: Current hierarchy level
+            level: Hierarchy level of the top-level items
         """
-        if not toc_items:
-            return
+        open_nodes: List[Tuple[TOCNode, int]] = [(parent_node, level - 1)]
+
+        for item in toc_items:
+            # PyMuPDF TOC format is [level, title, page, ...]
+            if len(item) < 3:
+                continue
 
-        processed_indices = set()
+            item_level, title, page_num = item[:3]
 
-        for i, item in enumerate(toc_items):
-            if i in processed_indices:
+            # Close nodes at the same or a deeper level than this item
+            while len(open_nodes) > 1 and open_nodes[-1][1] >= item_level:
+                open_nodes.pop()
+
+            parent, parent_level = open_nodes[-1]
+            if item_level != parent_level + 1:
                 continue
 
-            # PyMuPDF TOC format is [level, title, page, ...]
-            if len(item) >= 3:
-                item_level, title, page_num = item[:3]
-
-                # Adjust page number (PyMuPDF pages are 1-based, we want 0-based)
-                page_num = max(0, page_num - 1)
-                current_item_level = item_level  # TOC level from PDF
-
-                # Only process items that match our current tree level
-                if current_item_level == level:
-                    page_obj = self.doc.load_page(page_num)
-                    y_pos = self._find_heading_y_position(page_obj, title)
-                    node = TOCNode(
-                        title=title,
-                        page_num=page_num,
-                        level=level,
-                        parent=parent_node,
-                        y_position=y_pos,
-                    )
-                    parent_node.add_child(node)
-                    processed_indices.add(i)
-
-                    # Find children of this node
-                    children_toc_items = []
-                    j = i + 1
-                    while j < len(toc_items):
-                        if toc_items[j][0] > current_item_level:  # Deeper level
-                            children_toc_items.append(toc_items[j])
-                            processed_indices.add(j)
-                        elif toc_items[j][0] <= current_item_level:  # Same or higher level
-                            break
-                        j += 1
-
-                    if children_toc_items:
-                        self._process_outline(children_toc_items, node, level + 1)
-
-    def _set_end_pages_and_content(self, node: TOCNode) -> int:
+            # Titles such as "Introduction" or "Exercises" repeat across chapters
+            title = sys.intern(title)
+
+            # Adjust page number (PyMuPDF pages are 1-based, we want 0-based)
+            page_num = max(0, page_num - 1)
+
+            node = TOCNode(
+                title=title,
+                page_num=page_num,
+                level=item_level,
+                parent=parent,
+            )
+            parent.add_child(node)
+            open_nodes.append((node, item_level))
+
+    def _set_heading_positions(self) -> None:
         """
-        Recursively set end pages and extract content for each node.
+        Set the y-position of every TOC node's heading on its start page.
+
+        Runs after the tree is built so the outline walk never touches page content.
+        Headings are grouped by page so each page's word index is built once, then
+        released as soon as every heading on that page is placed. Lookups stay
+        sequential because a fitz.Document must not be shared across threads.
+        """
+        nodes_by_page: Dict[int, List[TOCNode]] = {}
+        for node in self.get_all_nodes():
+            if node is not self.root_node:
+                nodes_by_page.setdefault(node.page_num, []).append(node)
+
+        # Each distinct title is cleaned once, however many chapters repeat it
+        clean_titles: Dict[str, str] = {}
+        for page_num, page_nodes in nodes_by_page.items():
+            heading_ys = self._find_all_heading_ys(
+                page_num, [node.title for node in page_nodes], clean_titles
+            )
+            for node in page_nodes:
+                node.y_position = heading_ys[node.title]
+
+    def _find_all_heading_ys(
+        self,
+        page_num: int,
+        titles: List[str],
+        clean_titles: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, float]:
+        """
+        Find the y-positions of all headings on a page in one go.
+
+        The page's word index is built on the first lookup and released once every
+        title is placed, since content extraction only needs the cached blocks.
 
         Args:
-            node: The current node to process
+            page_num: 0-based page index
+            titles: Titles of the headings starting on the page
+            clean_titles: Optional memo of cleaned titles, shared across pages
 
         Returns:
-            The end page of this node (overall span)
+            A dict mapping each distinct title to its y-position (0.0 if not found)
         """
-        # Determine node's overall end page (span)
-        if not node.children:
-            # Leaf node: end_page is determined by the next sibling or document end
-            next_section_start_page = self.doc.page_count
-            if node.parent and node.parent.children:
-                siblings = node.parent.children
-                try:
-                    idx = siblings.index(node)
-                    if idx < len(siblings) - 1:
-                        next_section_start_page = siblings[idx + 1].page_num
-                except ValueError:
-                    pass  # Should not occur
-
-            node.end_page = max(
-                node.page_num, min(next_section_start_page - 1, self.doc.page_count - 1)
+        if clean_titles is None:
+            clean_titles = {}
+
+        heading_ys: Dict[str, float] = {}
+        for title in titles:
+            if title in heading_ys:
+                continue  # Same title twice on a page resolves to the same line
+            if title not in clean_titles:
+                clean_titles[title] = _clean_text(title)
+            heading_ys[title] = self._find_heading_y_position(
+                page_num, title, clean_titles[title]
             )
-        else:
-            # Non-leaf node: end_page is determined by the last child's end_page
-            last_child_end_page = -1
-            for child in node.children:
-                child_end_page = self._set_end_pages_and_content(child)
-                last_child_end_page = max(last_child_end_page, child_end_page)
-            node.end_page = max(node.page_num, last_child_end_page)
-
-        # Extract content for the current node
-        current_node_start_y = node.y_position if node.y_position is not None else 0.0
-        content_end_page_idx = node.end_page
-        content_end_y_on_final_page = None
-
-        if node.children:
-            first_child = node.children[0]
-            if first_child.page_num > node.page_num:
-                # Parent's content ends on the page before the first child's page
-                content_end_page_idx = first_child.page_num - 1
-            else:  # first_child.page_num == node.page_num
-                # Parent's content ends on the same page, just before the first child
-                content_end_page_idx = node.page_num
-                content_end_y_on_final_page = first_child.y_position
-        else:  # Leaf node
-            # Check if next sibling is on this content_end_page_idx
-            if node.parent and node.parent.children:
-                siblings = node.parent.children
-                try:
-                    idx = siblings.index(node)
-                    if idx < len(siblings) - 1:
-                        next_sibling = siblings[idx + 1]
-                        if next_sibling.page_num == content_end_page_idx:
-                            content_end_y_on_final_page = next_sibling.y_position
-                except ValueError:
-                    pass
-
-        # Ensure content_end_page_idx is valid
-        actual_content_end_page = min(
-            max(node.page_num, content_end_page_idx),
-            self.doc.page_count - 1
-        )
 
-        if node.page_num > actual_content_end_page:
-            node.content = ""  # No pages for content
-        else:
-            node.content = self._extract_content(
+        self._page_lines.pop(page_num, None)
+        self._line_index.pop(page_num, None)
+        return heading_ys
+
+    def _set_page_ranges(self) -> None:
+        """
+        Set end pages and content ranges for all nodes.
+
+        A node's content runs from its heading to the next heading on the page, whatever
+        its level, and its own pages are those its content comes from. Headings are taken
+        in (page, y) order so a TOC listed out of page order still gets each page's text.
+        A node's page span then also covers all of its descendants.
+        """
+        nodes = self.get_all_nodes()
+        last_page = self.doc.page_count - 1
+        # Stable sort: the root and same-position headings keep their pre-order
+        ordered = sorted(
+            nodes,
+            key=lambda node: (
                 node.page_num,
-                actual_content_end_page,
-                start_y_on_first_page=current_node_start_y,
-                end_y_on_final_page=content_end_y_on_final_page,
-            )
+                node.y_position if node.y_position is not None else 0.0,
+            ),
+        )
+
+        for i, node in enumerate(ordered):
+            start_y = node.y_position if node.y_position is not None else 0.0
+            end_page, end_y = last_page, None
+            if i < len(ordered) - 1 and ordered[i + 1].page_num <= last_page:
+                end_page, end_y = ordered[i + 1].page_num, ordered[i + 1].y_position
 
-        # Fallback for nodes that might have been missed
-        if node.title == "Document Root" and not self.toc and not node.content:
-            node.content = self._extract_content(0, self.doc.page_count - 1)
+            if node.page_num > end_page:
+                node.content = ""  # No pages for content
+                node.end_page = node.page_num
+                continue
+
+            # Text is extracted on first access, see get_node_content
+            node.content_range = (node.page_num, end_page, start_y, end_y)
+            node.end_page = end_page
+            if end_page > node.page_num and not self._has_text_above(end_page, end_y):
+                # The next heading tops its page, so the content ends a page earlier
+                node.end_page = end_page - 1
+
+        # Children come after their parent in pre-order, so a reverse walk sees every
+        # descendant's final end page before its parent's
+        for node in reversed(nodes):
+            parent = node.parent
+            child_end = node.end_page
+            if parent is None or child_end is None:
+                continue
+            parent_end = parent.end_page
+            if parent_end is None or child_end > parent_end:
+                parent.end_page = child_end
+
+    def _has_text_above(self, page_num: int, end_y: Optional[float]) -> bool:
+        """Check whether any text block on a page starts above end_y (None: page end)."""
+        if end_y is None:
+            end_y = float("inf")
+        return any(
+            block_y1 > 0.0 and block_y0 < end_y
+            for block_y0, block_y1, _ in self._get_text_blocks(page_num)
+        )
 
-        # Ensure end_page is at least the start page
-        if node.end_page is None or node.end_page < node.page_num:
-            node.end_page = node.page_num
+    def get_node_content(self, toc_node: TOCNode) -> str:
+        """
+        Get the text content of a node, extracting it from the PDF on first access.
 
-        return node.end_page
+        The document must still be open the first time a node's content is read.
+        """
+        if toc_node.content_range is not None:
+            start_page, end_page, start_y, end_y = toc_node.content_range
+            toc_node.content = self._extract_content(
+                start_page,
+                end_page,
+                start_y_on_first_page=start_y,
+                end_y_on_final_page=end_y,
+            )
+            toc_node.content_range = None
+        return toc_node.content
 
     def _extract_content(
         self,
@@ -244,56 +451,54 @@ class PDFTOCChunker(BaseDocumentChunker):
     ) -> str:
         """
         Extract text content from a range of pages, respecting y-boundaries on first/last page.
-        """
-        content_parts = []
 
+        Only the first and last pages are filtered by y; pages in between are taken whole.
+        """
         # Ensure start_page is not greater than end_page
         if start_page_idx > end_page_idx:
             return ""
 
-        for page_num in range(start_page_idx, end_page_idx + 1):
-            if not (0 <= page_num < self.doc.page_count):
-                continue
-
-            page = self.doc.load_page(page_num)
+        start_y = start_y_on_first_page if start_y_on_first_page is not None else 0.0
+        end_y = end_y_on_final_page if end_y_on_final_page is not None else float("inf")
+        page_count = self.doc.page_count
+        page_texts = []
 
-            # Determine y-boundaries for the current page
-            start_y = (
-                start_y_on_first_page if page_num == start_page_idx and 
-                start_y_on_first_page is not None else 0.0
-            )
-            
-            end_y = (
-                end_y_on_final_page if page_num == end_page_idx and 
-                end_y_on_final_page is not None else float("inf")
-            )
+        if start_page_idx == end_page_idx:
+            if 0 <= start_page_idx < page_count:
+                page_texts.append(
+                    self._extract_page_bounded(start_page_idx, start_y, end_y)
+                )
+        else:
+            if 0 <= start_page_idx < page_count:
+                page_texts.append(
+                    self._extract_page_bounded(start_page_idx, start_y, float("inf"))
+                )
+            for page_num in range(
+                max(start_page_idx + 1, 0), min(end_page_idx, page_count)
+            ):
+                page_texts.append(self._extract_full_page(page_num))
+            if 0 <= end_page_idx < page_count:
+                page_texts.append(self._extract_page_bounded(end_page_idx, 0.0, end_y))
+
+        return "\n".join(text for text in page_texts if text).strip()
+
+    def _extract_full_page(self, page_num: int) -> str:
+        """Extract the text of every block on a page, one block per line."""
+        return "\n".join(
+            " ".join(lines) for _, _, lines in self._get_text_blocks(page_num)
+        )
 
-            # If start_y is greater or equal to end_y on the same page, skip
-            if start_y >= end_y:
-                continue
+    def _extract_page_bounded(self, page_num: int, start_y: float, end_y: float) -> str:
+        """Extract the text of the blocks on a page that overlap [start_y, end_y)."""
+        if start_y >= end_y:
+            return ""
 
-            blocks = page.get_text("dict", flags=TEXT_EXTRACTION_FLAGS)["blocks"]
-            page_content = []
-            
-            for block in blocks:
-                if block.get("type") == 0:  # Text block
-                    block_y0 = block["bbox"][1]  # Top of block
-                    block_y1 = block["bbox"][3]  # Bottom of block
-
-                    # Check if block is within the y-boundaries
-                    if block_y1 > start_y and block_y0 < end_y:
-                        block_text_parts = []
-                        for line in block.get("lines", []):
-                            line_text = "".join(span["text"] for span in line.get("spans", []))
-                            block_text_parts.append(line_text)
-                        
-                        if block_text_parts:
-                            page_content.append(" ".join(block_text_parts))
-
-            if page_content:
-                content_parts.append("\n".join(page_content))
-
-        return "\n".join(content_parts).strip()
+        # Block lines are joined like the spans they came from
+        return "\n".join(
+            " ".join(lines)
+            for block_y0, block_y1, lines in self._get_text_blocks(page_num)
+            if block_y1 > start_y and block_y0 < end_y
+        )
 
     def close(self) -> None:
         """Close the PDF file and clean up resources."""
@@ -301,3 +506,6 @@ class PDFTOCChunker(BaseDocumentChunker):
             self.doc.close()
             self.doc = None
             self._document_loaded = False
+        self._page_blocks = {}
+        self._page_lines = {}
+        self._line_index = {}
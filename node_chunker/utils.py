@@ -3,13 +3,23 @@ Utility functions for document chunking operations.
 """
 import logging
 import os
+import pickle
 import tempfile
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 import requests
+from llama_index.core.schema import TextNode
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated downloads reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
 def download_temp_file(url: str, suffix: Optional[str] = None) -> str:
     """
     Download content from a URL to a temporary file.
@@ -25,7 +35,7 @@ def download_temp_file(url: str, suffix: Optional[str] = None) -> str:
         ValueError: If the download fails
     """
     try:
-        response = requests.get(url, stream=True, timeout=30)
+        response = _SESSION.get(url, stream=True, timeout=30)
         response.raise_for_status()
         
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
@@ -42,6 +52,67 @@ def download_temp_file(url: str, suffix: Optional[str] = None) -> str:
         logger.error(f"Error downloading from {url}: {str(e)}")
         raise ValueError(f"Failed to download file: {str(e)}")
 
+def download_content(url: str) -> bytes:
+    """
+    Download content from a URL into memory.
+    
+    Args:
+        url: The URL to download from
+        
+    Returns:
+        The raw bytes of the response body
+        
+    Raises:
+        ValueError: If the download fails
+    """
+    try:
+        response = _SESSION.get(url, timeout=30)
+        response.raise_for_status()
+        return response.content
+    except Exception as e:
+        logger.error(f"Error downloading from {url}: {str(e)}")
+        raise ValueError(f"Failed to download file: {str(e)}")
+
+def download_text(url: str) -> str:
+    """
+    Download a text document from a URL.
+    
+    Args:
+        url: The URL to download from
+        
+    Returns:
+        The response body decoded as text
+        
+    Raises:
+        ValueError: If the download fails
+    """
+    try:
+        response = _SESSION.get(url, timeout=30)
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
+        logger.error(f"Error downloading from {url}: {str(e)}")
+        raise ValueError(f"Failed to download file: {str(e)}")
+
+def download_contents(urls: List[str], max_workers: int = 8) -> List[bytes]:
+    """
+    Download several URLs in parallel.
+    
+    Args:
+        urls: The URLs to download from
+        max_workers: Maximum number of concurrent downloads
+        
+    Returns:
+        The raw bytes of each response, in the same order as urls
+        
+    Raises:
+        ValueError: If any download fails
+    """
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(download_content, urls))
+
 def read_file_content(file_path: str, encoding: str = "utf-8") -> str:
     """
     Read content from a file with proper error handling.
@@ -62,3 +133,48 @@ def read_file_content(file_path: str, encoding: str = "utf-8") -> str:
     except Exception as e:
         logger.error(f"Error reading file {file_path}: {str(e)}")
         raise ValueError(f"Failed to read file {file_path}: {str(e)}")
+
+def load_cached_nodes(cache_dir: str, key: str) -> Optional[List[TextNode]]:
+    """
+    Load previously cached nodes.
+    
+    Args:
+        cache_dir: Directory holding the cache entries
+        key: Cache key of the entry
+        
+    Returns:
+        The cached nodes, or None if there is no usable entry
+    """
+    cache_path = os.path.join(os.path.expanduser(cache_dir), f"{key}.pkl")
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache entry {cache_path}: {str(e)}")
+        return None
+
+def save_cached_nodes(cache_dir: str, key: str, nodes: List[TextNode]) -> None:
+    """
+    Cache nodes on disk. Failures are logged and otherwise ignored.
+    
+    Args:
+        cache_dir: Directory holding the cache entries
+        key: Cache key of the entry
+        nodes: The nodes to cache
+    """
+    cache_dir = os.path.expanduser(cache_dir)
+    cache_path = os.path.join(cache_dir, f"{key}.pkl")
+    temp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+            temp_path = f.name
+            pickle.dump(nodes, f)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
+        logger.warning(f"Failed to write cache entry {cache_path}: {str(e)}")
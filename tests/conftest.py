@@ -0,0 +1,6 @@
+import importlib.util
+
+# Don't even collect the PDF tests when PyMuPDF is missing
+collect_ignore = []
+if importlib.util.find_spec("fitz") is None:
+    collect_ignore.append("test_pdf_chunking.py")
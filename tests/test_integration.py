@@ -1,20 +1,13 @@
+import functools
 import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from node_chunker.chunks import DocumentFormat, chunk_document_by_toc_to_text_nodes
 
 
-class TestIntegration(unittest.TestCase):
-    def setUp(self):
-        # Create test directory and files
-        self.test_dir = os.path.join(os.path.dirname(__file__), "test_files")
-        os.makedirs(self.test_dir, exist_ok=True)
-
-        # Track files created during tests for cleanup
-        self.test_files_to_cleanup = []
-
-        # Create a markdown test file
-        self.test_markdown = """# Test Document
+TEST_MARKDOWN = """# Test Document
 This is a test document.
 
 ## Section 1
@@ -26,60 +19,104 @@ This is subsection 1.1.
 ## Section 2
 This is section 2.
 """
-        self.markdown_path = os.path.join(self.test_dir, "integration_test.md")
-        with open(self.markdown_path, "w") as f:
-            f.write(self.test_markdown)
 
-        # Add to cleanup list
-        self.test_files_to_cleanup.append(self.markdown_path)
 
-    def tearDown(self):
-        """Clean up any files created during tests"""
-        for file_path in self.test_files_to_cleanup:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+@functools.lru_cache(maxsize=None)
+def _nodes(source, format_type):
+    """Chunk a source once per distinct input; callers must not mutate the nodes"""
+    return tuple(chunk_document_by_toc_to_text_nodes(source, format_type=format_type))
+
 
+class TestIntegration(unittest.TestCase):
     def test_markdown_integration(self):
         """Test integration of markdown chunking with command line arguments"""
         # Test with the convenience function
-        text_nodes = chunk_document_by_toc_to_text_nodes(
-            self.markdown_path, format_type=DocumentFormat.MARKDOWN
-        )
+        text_nodes = _nodes(TEST_MARKDOWN, DocumentFormat.MARKDOWN)
 
         # Basic verification
         self.assertEqual(len(text_nodes), 4)  # 4 sections
 
         # Check that all sections are present
-        titles = [node.metadata["title"] for node in text_nodes]
-        self.assertIn("Test Document", titles)
-        self.assertIn("Section 1", titles)
-        self.assertIn("Subsection 1.1", titles)
-        self.assertIn("Section 2", titles)
+        by_title = {node.metadata["title"]: node for node in text_nodes}
+        self.assertIn("Test Document", by_title)
+        self.assertIn("Section 1", by_title)
+        self.assertIn("Subsection 1.1", by_title)
+        self.assertIn("Section 2", by_title)
 
         # Check context paths
-        for node in text_nodes:
-            if node.metadata["title"] == "Subsection 1.1":
-                self.assertEqual(
-                    node.metadata["context"],
-                    "Test Document > Section 1 > Subsection 1.1",
-                )
+        self.assertEqual(
+            by_title["Subsection 1.1"].metadata["context"],
+            "Test Document > Section 1 > Subsection 1.1",
+        )
 
     def test_markdown_text_integration(self):
         """Test integration with raw markdown text instead of a file"""
         # Test with raw markdown text
-        text_nodes = chunk_document_by_toc_to_text_nodes(
-            self.test_markdown, format_type=DocumentFormat.MARKDOWN
-        )
+        text_nodes = _nodes(TEST_MARKDOWN, DocumentFormat.MARKDOWN)
 
         # Basic verification
         self.assertEqual(len(text_nodes), 4)  # 4 sections
 
         # Check context metadata for nested sections
-        for node in text_nodes:
-            if node.metadata["title"] == "Section 1":
-                self.assertEqual(node.metadata["context"], "Test Document > Section 1")
-            elif node.metadata["title"] == "Section 2":
-                self.assertEqual(node.metadata["context"], "Test Document > Section 2")
+        by_title = {node.metadata["title"]: node for node in text_nodes}
+        self.assertEqual(
+            by_title["Section 1"].metadata["context"], "Test Document > Section 1"
+        )
+        self.assertEqual(
+            by_title["Section 2"].metadata["context"], "Test Document > Section 2"
+        )
+
+    def test_node_cache(self):
+        """Test that cached nodes are reused until the source file changes"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Work on a private copy since the test edits the file
+            markdown_path = os.path.join(cache_dir, "cached_test.md")
+            with open(markdown_path, "w") as f:
+                f.write(TEST_MARKDOWN)
+
+            first_nodes = chunk_document_by_toc_to_text_nodes(
+                markdown_path,
+                format_type=DocumentFormat.MARKDOWN,
+                cache_dir=cache_dir,
+            )
+            cached_nodes = chunk_document_by_toc_to_text_nodes(
+                markdown_path,
+                format_type=DocumentFormat.MARKDOWN,
+                cache_dir=cache_dir,
+            )
+            # Parsing again would generate fresh node ids
+            self.assertEqual(
+                [node.id_ for node in cached_nodes], [node.id_ for node in first_nodes]
+            )
+
+            with open(markdown_path, "a") as f:
+                f.write("\n## Section 3\nThis is section 3.\n")
+            os.utime(markdown_path, ns=(0, 0))
+
+            updated_nodes = chunk_document_by_toc_to_text_nodes(
+                markdown_path,
+                format_type=DocumentFormat.MARKDOWN,
+                cache_dir=cache_dir,
+            )
+            self.assertEqual(len(updated_nodes), 5)
+
+    def test_node_cache_version(self):
+        """Test that nodes cached by another chunker version are not reused"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first_nodes = chunk_document_by_toc_to_text_nodes(
+                TEST_MARKDOWN, format_type=DocumentFormat.MARKDOWN, cache_dir=cache_dir
+            )
+            with patch("node_chunker.chunks.CACHE_SCHEMA_VERSION", -1):
+                other_nodes = chunk_document_by_toc_to_text_nodes(
+                    TEST_MARKDOWN,
+                    format_type=DocumentFormat.MARKDOWN,
+                    cache_dir=cache_dir,
+                )
+
+        # Parsing again generates fresh node ids
+        self.assertNotEqual(
+            [node.id_ for node in other_nodes], [node.id_ for node in first_nodes]
+        )
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+import collections
+import functools
 import os
 import tempfile
 import unittest
@@ -5,66 +7,110 @@ from unittest.mock import MagicMock, patch
 
 from llama_index.core.schema import NodeRelationship
 
-from node_chunker.pdf_chunking import PDFTOCChunker
+try:
+    import fitz
 
+    from node_chunker.pdf_chunking import PDFTOCChunker
+except ImportError:
+    fitz = None
 
+
+def create_get_text_side_effect(page_idx, titles_on_page):
+    """Build a get_text stub for a page holding its TOC titles above a content block"""
+    page_content_text = f"Content of page {page_idx + 1}"
+
+    # Built once per page; the chunker only reads the blocks it gets back
+    # (x0, y0, x1, y1, text, block_no, block_type)
+    blocks = []
+    y_val = 10.0
+    # Add blocks for titles to be found by _find_heading_y_position
+    for title_text in titles_on_page:
+        blocks.append((10, y_val, 500, y_val + 10, title_text, len(blocks), 0))
+        y_val += 20
+    # Add the page content block for _extract_content
+    blocks.append((10, y_val, 500, y_val + 100, page_content_text, len(blocks), 0))
+
+    def get_text_side_effect_impl(*args, **kwargs):
+        if args and args[0] == "blocks":
+            return blocks
+        # Plain text, used by build_toc_tree when there is no TOC
+        return page_content_text
+
+    return get_text_side_effect_impl
+
+
+class _FakePage:
+    """Plain stand-in for a fitz page, much cheaper to build and call than a MagicMock"""
+
+    __slots__ = ("get_text",)
+
+    def __init__(self, page_idx, titles_on_page):
+        self.get_text = create_get_text_side_effect(page_idx, titles_on_page)
+
+    def search_for(self, text):
+        return []
+
+
+class _FakeDoc:
+    """Plain stand-in for a fitz document serving prebuilt pages"""
+
+    __slots__ = ("pages", "_toc", "page_count", "load_page")
+
+    def __init__(self, toc, pages):
+        self._toc = toc
+        self.pages = pages
+        self.page_count = len(pages)
+        # Builtin lookup, no Python frame per page load
+        self.load_page = pages.__getitem__
+
+    def get_toc(self):
+        return self._toc
+
+    def close(self):
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def _fake_pages(toc, page_count):
+    """Build the pages for a (hashable) TOC once; the pages hold no state, so tests share them"""
+    # Group the TOC titles by 0-based page in a single pass
+    page_to_titles = collections.defaultdict(list)
+    for _, title, page in toc:
+        page_to_titles[page - 1].append(title)
+
+    return tuple(_FakePage(i, page_to_titles[i]) for i in range(page_count))
+
+
+@unittest.skipIf(fitz is None, "PyMuPDF not installed")
 class TestPDFChunking(unittest.TestCase):
-    def setUp(self):
-        # Create a test directory
-        self.test_dir = os.path.join(os.path.dirname(__file__), "test_files")
-        os.makedirs(self.test_dir, exist_ok=True)
-
-        # Create a temp file for mock PDF
-        self.temp_pdf = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-        self.temp_pdf_path = self.temp_pdf.name
-        self.temp_pdf.close()
-
-    def tearDown(self):
-        # Clean up the temp file
-        if os.path.exists(self.temp_pdf_path):
-            os.unlink(self.temp_pdf_path)
-
-    @patch("fitz.open")
-    def test_no_toc_pdf(self, mock_open):
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = os.path.join(os.path.dirname(__file__), "test_files")
+        os.makedirs(cls.test_dir, exist_ok=True)
+
+        # The unit tests inject a fake document loader, so the file is never read
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
+            cls.temp_pdf_path = temp_pdf.name
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.temp_pdf_path):
+            os.unlink(cls.temp_pdf_path)
+
+    def _doc_loader(self, toc, page_count):
+        """Build a loader returning a fake fitz document with the given TOC and pages"""
+        # Each test gets its own document around the shared pages
+        doc = _FakeDoc(toc, _fake_pages(tuple(map(tuple, toc)), page_count))
+        return lambda *args, **kwargs: doc
+
+    def test_no_toc_pdf(self):
         """Test chunking a PDF with no table of contents"""
-        mock_doc = MagicMock()
-        mock_doc.get_toc.return_value = []
-        mock_doc.page_count = 3
-
-        mock_pages_list = []
-        for i in range(mock_doc.page_count):
-            mock_page_obj = MagicMock(name=f"Page_{i}")
-
-            # Define the side_effect function for this specific page's get_text
-            def create_get_text_side_effect(page_idx_closure):
-                def get_text_side_effect_impl(*args, **kwargs):
-                    page_content_text = f"Content of page {page_idx_closure + 1}"
-                    if args and args[0] == "dict":
-                        return {
-                            "blocks": [
-                                {
-                                    "type": 0,
-                                    "bbox": [10, 10, 500, 100],  # Example bbox
-                                    "lines": [{"spans": [{"text": page_content_text}]}],
-                                }
-                            ],
-                            "width": 600,
-                            "height": 800,  # Example page dimensions
-                        }
-                    else:
-                        # This branch is hit by the loop in build_toc_tree for no-TOC case
-                        return page_content_text
-
-                return get_text_side_effect_impl
-
-            mock_page_obj.get_text.side_effect = create_get_text_side_effect(i)
-            mock_pages_list.append(mock_page_obj)
-
-        mock_doc.load_page.side_effect = lambda page_idx: mock_pages_list[page_idx]
-        mock_open.return_value = mock_doc
+        doc_loader = self._doc_loader([], 3)
 
         chunker = PDFTOCChunker(
-            pdf_path=self.temp_pdf_path, source_display_name="test_no_toc.pdf"
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_no_toc.pdf",
+            doc_loader=doc_loader,
         )
         text_nodes = chunker.get_text_nodes()
 
@@ -78,11 +124,8 @@ class TestPDFChunking(unittest.TestCase):
         expected_content = "Content of page 1\nContent of page 2\nContent of page 3\n"
         self.assertEqual(text_nodes[0].text.strip(), expected_content.strip())
 
-    @patch("fitz.open")
-    def test_hierarchical_pdf(self, mock_open):
+    def test_hierarchical_pdf(self):
         """Test chunking a PDF with a hierarchical TOC structure"""
-        mock_doc = MagicMock()
-        mock_doc.page_count = 10
         mock_toc = [
             [1, "Chapter 1", 1],
             [2, "Section 1.1", 2],
@@ -91,263 +134,86 @@ class TestPDFChunking(unittest.TestCase):
             [1, "Chapter 2", 5],
             [2, "Section 2.1", 6],
         ]
-        mock_doc.get_toc.return_value = mock_toc
-
-        mock_pages_list = []
-        for i in range(mock_doc.page_count):
-            mock_page_obj = MagicMock(name=f"Page_{i}")
-            titles_on_this_page_i = [item[1] for item in mock_toc if item[2] - 1 == i]
-
-            def create_get_text_side_effect(page_idx_closure, titles_on_page_closure):
-                def get_text_side_effect_impl(*args, **kwargs):
-                    page_text_for_content = f"Content of page {page_idx_closure + 1}"
-                    if titles_on_page_closure:
-                        page_text_for_content += " " + " ".join(titles_on_page_closure)
-
-                    if args and args[0] == "dict":
-                        blocks_for_dict = []
-                        y_val = 10.0
-                        # Add blocks for titles to be found by _find_heading_y_position
-                        for title_text in titles_on_page_closure:
-                            blocks_for_dict.append(
-                                {
-                                    "type": 0,
-                                    "bbox": [10, y_val, 500, y_val + 10],
-                                    "lines": [{"spans": [{"text": title_text}]}],
-                                }
-                            )
-                            y_val += 20
-                        # Add a generic block for content extraction by _extract_content
-                        blocks_for_dict.append(
-                            {
-                                "type": 0,
-                                "bbox": [10, y_val, 500, y_val + 100],
-                                "lines": [
-                                    {
-                                        "spans": [
-                                            {
-                                                "text": f"Some other text on page {page_idx_closure + 1}"
-                                            }
-                                        ]
-                                    }
-                                ],
-                            }
-                        )
-                        return {"blocks": blocks_for_dict, "width": 600, "height": 800}
-                    else:
-                        return page_text_for_content + "\n"
-
-                return get_text_side_effect_impl
-
-            mock_page_obj.get_text.side_effect = create_get_text_side_effect(
-                i, titles_on_this_page_i
-            )
-            mock_pages_list.append(mock_page_obj)
-
-        mock_doc.load_page.side_effect = lambda page_idx: mock_pages_list[page_idx]
-        mock_open.return_value = mock_doc
+        doc_loader = self._doc_loader(mock_toc, 10)
 
         chunker = PDFTOCChunker(
-            pdf_path=self.temp_pdf_path, source_display_name="test_hierarchy.pdf"
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_hierarchy.pdf",
+            doc_loader=doc_loader,
         )
         text_nodes = chunker.get_text_nodes()
 
-        # Get nodes by title for easier testing
-        nodes_by_title = {node.metadata["title"]: node for node in text_nodes}
-
         # Should be 6 nodes for the 6 TOC entries
         self.assertEqual(len(text_nodes), 6)
 
         # Check titles and levels
-        self.assertIn("Chapter 1", nodes_by_title)
-        self.assertIn("Section 1.1", nodes_by_title)
-        self.assertIn("Subsection 1.1.1", nodes_by_title)
+        by_title = chunker.nodes_by_title
+        self.assertIn("Chapter 1", by_title)
+        self.assertIn("Section 1.1", by_title)
+        self.assertIn("Subsection 1.1.1", by_title)
 
-        self.assertEqual(nodes_by_title["Chapter 1"].metadata["level"], 1)
-        self.assertEqual(nodes_by_title["Section 1.1"].metadata["level"], 2)
-        self.assertEqual(nodes_by_title["Subsection 1.1.1"].metadata["level"], 3)
+        self.assertEqual(by_title["Chapter 1"].metadata["level"], 1)
+        self.assertEqual(by_title["Section 1.1"].metadata["level"], 2)
+        self.assertEqual(by_title["Subsection 1.1.1"].metadata["level"], 3)
 
         # Check context paths
-        self.assertEqual(nodes_by_title["Chapter 1"].metadata["context"], "Chapter 1")
+        self.assertEqual(by_title["Chapter 1"].metadata["context"], "Chapter 1")
         self.assertEqual(
-            nodes_by_title["Section 1.1"].metadata["context"], "Chapter 1 > Section 1.1"
+            by_title["Section 1.1"].metadata["context"], "Chapter 1 > Section 1.1"
         )
         self.assertEqual(
-            nodes_by_title["Subsection 1.1.1"].metadata["context"],
+            by_title["Subsection 1.1.1"].metadata["context"],
             "Chapter 1 > Section 1.1 > Subsection 1.1.1",
         )
 
-    @patch("fitz.open")
-    def test_relationships(self, mock_open):
+    def test_relationships(self):
         """Test that node relationships are correctly established in PDF chunks"""
-        mock_doc = MagicMock()
-        mock_doc.page_count = 5
         mock_toc = [[1, "Chapter 1", 1], [2, "Section 1.1", 2], [1, "Chapter 2", 3]]
-        mock_doc.get_toc.return_value = mock_toc
-
-        mock_pages_list = []
-        for i in range(mock_doc.page_count):
-            mock_page_obj = MagicMock(name=f"Page_{i}")
-            titles_on_this_page_i = [item[1] for item in mock_toc if item[2] - 1 == i]
-
-            def create_get_text_side_effect(page_idx_closure, titles_on_page_closure):
-                def get_text_side_effect_impl(*args, **kwargs):
-                    page_text_for_content = f"Content of page {page_idx_closure + 1}"
-                    if titles_on_page_closure:
-                        page_text_for_content += " " + " ".join(titles_on_page_closure)
-
-                    if args and args[0] == "dict":
-                        blocks_for_dict = []
-                        y_val = 10.0
-                        for title_text in titles_on_page_closure:
-                            blocks_for_dict.append(
-                                {
-                                    "type": 0,
-                                    "bbox": [10, y_val, 500, y_val + 10],
-                                    "lines": [{"spans": [{"text": title_text}]}],
-                                }
-                            )
-                            y_val += 20
-                        blocks_for_dict.append(
-                            {
-                                "type": 0,
-                                "bbox": [10, y_val, 500, y_val + 100],
-                                "lines": [
-                                    {
-                                        "spans": [
-                                            {
-                                                "text": f"Some other text on page {page_idx_closure + 1}"
-                                            }
-                                        ]
-                                    }
-                                ],
-                            }
-                        )
-                        return {"blocks": blocks_for_dict, "width": 600, "height": 800}
-                    else:
-                        return page_text_for_content + "\n"
-
-                return get_text_side_effect_impl
-
-            mock_page_obj.get_text.side_effect = create_get_text_side_effect(
-                i, titles_on_this_page_i
-            )
-            mock_pages_list.append(mock_page_obj)
-
-        mock_doc.load_page.side_effect = lambda page_idx: mock_pages_list[page_idx]
-        mock_open.return_value = mock_doc
+        doc_loader = self._doc_loader(mock_toc, 5)
 
         chunker = PDFTOCChunker(
-            pdf_path=self.temp_pdf_path, source_display_name="test_relationships.pdf"
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_relationships.pdf",
+            doc_loader=doc_loader,
         )
-        text_nodes = chunker.get_text_nodes()
-
-        # Create lookup dictionaries
-        nodes_by_title = {node.metadata["title"]: node for node in text_nodes}
-        nodes_by_id = {node.id_: node for node in text_nodes}
+        chunker.get_text_nodes()
+        by_title, by_id = chunker.nodes_by_title, chunker.nodes_by_id
 
         # Test parent-child relationships
-        chapter1 = nodes_by_title["Chapter 1"]
-        section1_1 = nodes_by_title["Section 1.1"]
+        chapter1 = by_title["Chapter 1"]
+        section1_1 = by_title["Section 1.1"]
 
         # Check that Section 1.1 has Chapter 1 as parent
         self.assertIn(NodeRelationship.PARENT, section1_1.relationships)
         parent_id = section1_1.relationships[NodeRelationship.PARENT].node_id
-        parent_node = nodes_by_id[parent_id]
+        parent_node = by_id[parent_id]
         self.assertEqual(parent_node.metadata["title"], "Chapter 1")
 
         # Check that Chapter 1 has Section 1.1 as child
         self.assertIn(NodeRelationship.CHILD, chapter1.relationships)
         child_ids = [r.node_id for r in chapter1.relationships[NodeRelationship.CHILD]]
         self.assertTrue(
-            any(
-                nodes_by_id[cid].metadata["title"] == "Section 1.1" for cid in child_ids
-            )
+            any(by_id[cid].metadata["title"] == "Section 1.1" for cid in child_ids)
         )
 
-    @patch("fitz.open")
-    def test_page_extraction(self, mock_open):
+    def test_page_extraction(self):
         """Test that page content is correctly extracted for each node"""
-        mock_doc = MagicMock()
-        mock_doc.page_count = 5
         mock_toc = [
             [1, "Chapter 1", 1],  # spans pages 1-2 (idx 0-1)
             [1, "Chapter 2", 3],  # spans pages 3-5 (idx 2-4)
         ]
-        mock_doc.get_toc.return_value = mock_toc
-
-        mock_pages_list = []
-        for i in range(mock_doc.page_count):
-            mock_page_obj = MagicMock(name=f"Page_{i}")
-            titles_on_this_page_i = [item[1] for item in mock_toc if item[2] - 1 == i]
-
-            def create_get_text_side_effect(page_idx_closure, titles_on_page_closure):
-                def get_text_side_effect_impl(*args, **kwargs):
-                    # For _extract_content, we need to provide the basic page content.
-                    # The titles themselves are usually part of this content.
-                    page_text_for_content = f"Content of page {page_idx_closure + 1}"
-                    # If a title is on this page, _find_heading_y_position needs to find it.
-                    # _extract_content will then grab text around it.
-
-                    if args and args[0] == "dict":
-                        blocks_for_dict = []
-                        y_val = 10.0
-                        # Simulate titles for _find_heading_y_position
-                        for title_text in titles_on_page_closure:
-                            blocks_for_dict.append(
-                                {
-                                    "type": 0,
-                                    "bbox": [10, y_val, 500, y_val + 10],  # y for title
-                                    "lines": [{"spans": [{"text": title_text}]}],
-                                }
-                            )
-                            y_val += 20
-                        # Simulate main content for _extract_content
-                        blocks_for_dict.append(
-                            {
-                                "type": 0,
-                                "bbox": [
-                                    10,
-                                    y_val,
-                                    500,
-                                    y_val + 100,
-                                ],  # y for main content
-                                "lines": [
-                                    {
-                                        "spans": [
-                                            {
-                                                "text": f"Content of page {page_idx_closure + 1}"
-                                            }
-                                        ]
-                                    }
-                                ],
-                            }
-                        )
-                        return {"blocks": blocks_for_dict, "width": 600, "height": 800}
-                    else:
-                        # Fallback, though _extract_content uses "dict"
-                        return f"Content of page {page_idx_closure + 1}\n"
-
-                return get_text_side_effect_impl
-
-            mock_page_obj.get_text.side_effect = create_get_text_side_effect(
-                i, titles_on_this_page_i
-            )
-            mock_pages_list.append(mock_page_obj)
-
-        mock_doc.load_page.side_effect = lambda page_idx: mock_pages_list[page_idx]
-        mock_open.return_value = mock_doc
+        doc_loader = self._doc_loader(mock_toc, 5)
 
         chunker = PDFTOCChunker(
-            pdf_path=self.temp_pdf_path, source_display_name="test_extraction.pdf"
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_extraction.pdf",
+            doc_loader=doc_loader,
         )
-        text_nodes = chunker.get_text_nodes()
+        chunker.get_text_nodes()
 
         # Test page ranges and content
-        nodes_by_title = {node.metadata["title"]: node for node in text_nodes}
-
-        chapter1 = nodes_by_title["Chapter 1"]
-        chapter2 = nodes_by_title["Chapter 2"]
+        chapter1 = chunker.nodes_by_title["Chapter 1"]
+        chapter2 = chunker.nodes_by_title["Chapter 2"]
 
         # Check page ranges
         self.assertEqual(chapter1.metadata["start_page_idx"], 0)  # 0-based indexing
@@ -359,7 +225,7 @@ class TestPDFChunking(unittest.TestCase):
         self.assertEqual(chapter2.metadata["page_label"], "3-5")
 
         # Check content extraction
-        # The mock for get_text("dict",...) returns "Content of page X" as one of the blocks.
+        # The mock for get_text("blocks",...) returns "Content of page X" as one of the blocks.
         # _extract_content joins these.
         self.assertEqual(
             chapter1.text.strip(), "Chapter 1\nContent of page 1\nContent of page 2"
@@ -369,6 +235,127 @@ class TestPDFChunking(unittest.TestCase):
             "Chapter 2\nContent of page 3\nContent of page 4\nContent of page 5",
         )
 
+    def test_parent_span_covers_last_child(self):
+        """Test that a parent's span reaches its last child's page when the next chapter starts there"""
+        mock_toc = [[1, "Chapter A", 1], [2, "Section A.1", 2], [1, "Chapter B", 2]]
+
+        chunker = PDFTOCChunker(
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_parent_span.pdf",
+            doc_loader=self._doc_loader(mock_toc, 3),
+        )
+        chunker.get_text_nodes()
+        chapter_a = chunker.nodes_by_title["Chapter A"]
+        section_a1 = chunker.nodes_by_title["Section A.1"]
+
+        self.assertEqual(section_a1.metadata["start_page_idx"], 1)
+        self.assertEqual(chapter_a.metadata["end_page_idx"], 1)
+        self.assertEqual(chapter_a.metadata["page_label"], "1-2")
+
+    def test_end_page_includes_text_above_next_heading(self):
+        """Test that the page holding the next heading counts when text sits above it"""
+        mock_toc = [[1, "Chapter 1", 1], [1, "Chapter 2", 2]]
+        # Page 2 starts with the end of chapter 1, then the chapter 2 heading
+        pages = (
+            _FakePage(0, ["Chapter 1"]),
+            _FakePage(1, ["Closing remarks", "Chapter 2"]),
+            _FakePage(2, []),
+        )
+        doc = _FakeDoc(mock_toc, pages)
+
+        chunker = PDFTOCChunker(
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_end_page.pdf",
+            doc_loader=lambda *args, **kwargs: doc,
+        )
+        chunker.get_text_nodes()
+        chapter1 = chunker.nodes_by_title["Chapter 1"]
+        chapter2 = chunker.nodes_by_title["Chapter 2"]
+
+        self.assertTrue(chapter1.text.endswith("Closing remarks"))
+        self.assertEqual(chapter1.metadata["end_page_idx"], 1)
+        self.assertEqual(chapter1.metadata["page_label"], "1-2")
+        self.assertEqual(chapter2.metadata["page_label"], "2-3")
+
+    def test_unordered_toc(self):
+        """Test that each heading gets its own page text when the TOC is out of page order"""
+        mock_toc = [[1, "Appendix", 3], [1, "Intro", 1], [1, "Body", 2]]
+
+        chunker = PDFTOCChunker(
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_unordered.pdf",
+            doc_loader=self._doc_loader(mock_toc, 3),
+        )
+        chunker.get_text_nodes()
+        by_title = chunker.nodes_by_title
+
+        self.assertEqual(by_title["Intro"].text, "Intro\nContent of page 1")
+        self.assertEqual(by_title["Body"].text, "Body\nContent of page 2")
+        self.assertEqual(by_title["Appendix"].text, "Appendix\nContent of page 3")
+        self.assertEqual(by_title["Appendix"].metadata["page_label"], "3")
+
+    def test_document_opened_once(self):
+        """Test that the document is opened once however often it is loaded"""
+        doc_loader = MagicMock(side_effect=self._doc_loader([[1, "Chapter 1", 1]], 2))
+
+        with PDFTOCChunker(
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_open_once.pdf",
+            doc_loader=doc_loader,
+        ) as chunker:
+            chunker.load_document()
+            chunker.build_toc_tree()
+            chunker.get_text_nodes()
+
+        doc_loader.assert_called_once_with(self.temp_pdf_path)
+
+    def test_wrapped_heading_position(self):
+        """Test that a heading wrapped over two lines is located via page search"""
+        mock_doc = MagicMock()
+        mock_doc.page_count = 1
+        mock_doc.get_toc.return_value = []
+        mock_page = MagicMock(name="Page_0")
+        mock_page.get_text.return_value = [
+            (10, 10, 500, 40, "Intro text", 0, 0),
+            (10, 50, 500, 80, "A Rather Long\nChapter Title", 1, 0),
+        ]
+        mock_page.search_for.return_value = [MagicMock(y0=65.0)]
+        mock_doc.load_page.return_value = mock_page
+        doc_loader = MagicMock(return_value=mock_doc)
+
+        chunker = PDFTOCChunker(
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_wrapped.pdf",
+            doc_loader=doc_loader,
+        )
+        chunker.load_document()
+
+        self.assertEqual(
+            chunker._find_heading_y_position(0, "A Rather Long Chapter Title"), 50
+        )
+        mock_page.search_for.assert_called_once_with("A Rather Long Chapter Title")
+
+    def test_find_all_heading_ys(self):
+        """Test that every heading on a page is located in one call"""
+        mock_toc = [[1, "Chapter 1", 1], [2, "Section 1.1", 1], [2, "Section 1.2", 1]]
+        doc_loader = self._doc_loader(mock_toc, 1)
+
+        chunker = PDFTOCChunker(
+            pdf_path=self.temp_pdf_path,
+            source_display_name="test_headings.pdf",
+            doc_loader=doc_loader,
+        )
+        chunker.load_document()
+
+        self.assertEqual(
+            chunker._find_all_heading_ys(
+                0, ["Chapter 1", "Section 1.1", "Section 1.2", "Missing"]
+            ),
+            {"Chapter 1": 10, "Section 1.1": 30, "Section 1.2": 50, "Missing": 0.0},
+        )
+        # The word index is only kept while the page's headings are placed
+        self.assertNotIn(0, chunker._line_index)
+
     def test_integration(self):
         """Test the PDF chunking with the convenience function (actual PDF file)"""
         # Skip this test if no test PDF is available
@@ -381,9 +368,13 @@ class TestPDFChunking(unittest.TestCase):
             chunk_document_by_toc_to_text_nodes,
         )
 
-        text_nodes = chunk_document_by_toc_to_text_nodes(
-            test_pdf_path,
-        )
+        with patch("fitz.open", wraps=fitz.open) as mock_open:
+            text_nodes = chunk_document_by_toc_to_text_nodes(
+                test_pdf_path,
+            )
+
+        # Local files are opened by path so MuPDF reads them on demand, not as bytes
+        mock_open.assert_called_once_with(test_pdf_path)
 
         # Basic verification that we got some nodes
         self.assertGreater(len(text_nodes), 0)
@@ -392,6 +383,80 @@ class TestPDFChunking(unittest.TestCase):
         for node in text_nodes:
             self.assertEqual(node.metadata["file_name"], "test.pdf")
 
+    def test_parallel_extraction(self):
+        """Test that extracting pages in worker processes gives the same nodes"""
+        test_pdf_path = os.path.join(self.test_dir, "test.pdf")
+        if not os.path.exists(test_pdf_path):
+            self.skipTest("No test PDF available - skipping parallel extraction test")
+
+        with PDFTOCChunker(test_pdf_path, "test.pdf") as chunker:
+            chunker.build_toc_tree()
+            sequential = [
+                (node.metadata["title"], node.text) for node in chunker.get_text_nodes()
+            ]
+        with PDFTOCChunker(test_pdf_path, "test.pdf", num_workers=2) as chunker:
+            chunker.build_toc_tree()
+            parallel = [
+                (node.metadata["title"], node.text) for node in chunker.get_text_nodes()
+            ]
+
+        self.assertGreater(len(sequential), 1)
+        self.assertEqual(parallel, sequential)
+
+    def test_pdf_bytes(self):
+        """Test that an in-memory PDF gives the same nodes as the file it came from"""
+        test_pdf_path = os.path.join(self.test_dir, "test.pdf")
+        if not os.path.exists(test_pdf_path):
+            self.skipTest("No test PDF available - skipping in-memory PDF test")
+
+        with open(test_pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        def chunk(**kwargs):
+            with PDFTOCChunker(source_display_name="test.pdf", **kwargs) as chunker:
+                chunker.build_toc_tree()
+                return [
+                    (node.metadata["title"], node.text)
+                    for node in chunker.get_text_nodes()
+                ]
+
+        from_path = chunk(pdf_path=test_pdf_path)
+        # The path doesn't exist, so any content must come from the bytes
+        doc_loader = MagicMock(wraps=fitz.open)
+        from_bytes = chunk(
+            pdf_path="missing.pdf", pdf_bytes=pdf_bytes, doc_loader=doc_loader
+        )
+        from_bytes_parallel = chunk(
+            pdf_path="missing.pdf", pdf_bytes=pdf_bytes, num_workers=2
+        )
+
+        doc_loader.assert_called_once_with(stream=pdf_bytes, filetype="pdf")
+        self.assertGreater(len(from_path), 1)
+        self.assertEqual(from_bytes, from_path)
+        self.assertEqual(from_bytes_parallel, from_path)
+
+    def test_node_cache(self):
+        """Test that a cached PDF is not opened again on the next run"""
+        test_pdf_path = os.path.join(self.test_dir, "test.pdf")
+        if not os.path.exists(test_pdf_path):
+            self.skipTest("No test PDF available - skipping node cache test")
+
+        from node_chunker.chunks import chunk_document_by_toc_to_text_nodes
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with patch("fitz.open", wraps=fitz.open) as mock_open:
+                first_nodes = chunk_document_by_toc_to_text_nodes(
+                    test_pdf_path, cache_dir=cache_dir
+                )
+                cached_nodes = chunk_document_by_toc_to_text_nodes(
+                    test_pdf_path, cache_dir=cache_dir
+                )
+
+        mock_open.assert_called_once()
+        self.assertEqual(
+            [node.id_ for node in cached_nodes], [node.id_ for node in first_nodes]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
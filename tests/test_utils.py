@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from node_chunker.chunks import DocumentFormat, chunk_document_by_toc_to_text_nodes
+from node_chunker.utils import download_contents
+
+HTML_PAGE = """<html><body>
+<h1>Guide</h1>
+<p>Intro text.</p>
+<h2>Setup</h2>
+<p>Setup text.</p>
+</body></html>
+"""
+
+RST_PAGE = """Guide
+=====
+
+Intro text.
+
+Setup
+-----
+
+Setup text.
+"""
+
+
+def _response(url, content=b"", text=""):
+    """Build a fake requests response for a URL"""
+    response = MagicMock()
+    response.content = content
+    response.text = text
+    if "missing" in url:
+        response.raise_for_status.side_effect = requests.HTTPError(f"404 for {url}")
+    return response
+
+
+class TestDownloads(unittest.TestCase):
+    @patch("node_chunker.utils._SESSION.get")
+    def test_download_contents_order(self, mock_get):
+        """Test that parallel downloads come back in the order of the URLs"""
+        mock_get.side_effect = lambda url, **kwargs: _response(
+            url, content=url.encode("utf-8")
+        )
+        urls = [f"https://example.com/{i}.pdf" for i in range(10)]
+
+        contents = download_contents(urls, max_workers=4)
+
+        self.assertEqual(contents, [url.encode("utf-8") for url in urls])
+
+    @patch("node_chunker.utils._SESSION.get")
+    def test_download_contents_failure(self, mock_get):
+        """Test that a failed download surfaces as a ValueError"""
+        mock_get.side_effect = lambda url, **kwargs: _response(url, content=b"ok")
+
+        with self.assertRaises(ValueError):
+            download_contents(
+                ["https://example.com/a.pdf", "https://example.com/missing.pdf"]
+            )
+
+    @patch("node_chunker.utils._SESSION.get")
+    def test_html_url(self, mock_get):
+        """Test that HTML URLs are fetched as text through the shared session"""
+        url = "https://example.com/guide.html"
+        mock_get.side_effect = lambda url, **kwargs: _response(url, text=HTML_PAGE)
+
+        text_nodes = chunk_document_by_toc_to_text_nodes(
+            url, format_type=DocumentFormat.HTML
+        )
+
+        mock_get.assert_called_once_with(url, timeout=30)
+        titles = {node.metadata["title"] for node in text_nodes}
+        self.assertIn("Guide", titles)
+        self.assertIn("Setup", titles)
+
+    @patch("node_chunker.utils._SESSION.get")
+    def test_rst_url(self, mock_get):
+        """Test that RST URLs are fetched as text through the shared session"""
+        url = "https://example.com/guide.rst"
+        mock_get.side_effect = lambda url, **kwargs: _response(url, text=RST_PAGE)
+
+        text_nodes = chunk_document_by_toc_to_text_nodes(
+            url, format_type=DocumentFormat.RST
+        )
+
+        mock_get.assert_called_once_with(url, timeout=30)
+        titles = {node.metadata["title"] for node in text_nodes}
+        self.assertIn("Guide", titles)
+        self.assertIn("Setup", titles)
+
+
+if __name__ == "__main__":
+    unittest.main()